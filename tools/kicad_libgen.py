@@ -22,20 +22,29 @@ structured markup -- this is exactly what they're good at.
 """
 
 import argparse
+import io
 import json
 import math
+import os
 import sys
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, TextIO
+
+
+# Pad layer sets, shared so every pad references the same string object
+_DEFAULT_SMD_LAYERS = '"F.Cu" "F.Paste" "F.Mask"'
+_TH_LAYERS = '"*.Cu" "*.Mask"'
+_CU_MASK_LAYERS = '"F.Cu" "F.Mask"'
+_PASTE_LAYER = '"F.Paste"'
 
 
 # ==============================================================
 # Data Models
 # ==============================================================
 
-@dataclass
+@dataclass(slots=True)
 class Pin:
     """Schematic symbol pin definition."""
     number: str
@@ -48,7 +57,7 @@ class Pin:
     shape: str = "line"  # line, inverted, clock, inverted_clock
 
 
-@dataclass
+@dataclass(slots=True)
 class Pad:
     """Footprint pad definition."""
     number: str
@@ -59,11 +68,11 @@ class Pad:
     width: float = 1.0
     height: float = 1.0
     drill: Optional[float] = None
-    layers: str = '"F.Cu" "F.Paste" "F.Mask"'
+    layers: str = _DEFAULT_SMD_LAYERS
     rotation: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolSpec:
     """Complete symbol specification."""
     name: str
@@ -76,7 +85,7 @@ class SymbolSpec:
     body_height: float = 15.24
 
 
-@dataclass
+@dataclass(slots=True)
 class FootprintSpec:
     """Complete footprint specification."""
     name: str
@@ -98,156 +107,244 @@ def gen_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def _batch_uuids(n: int) -> list[str]:
+    """Generate n random UUID v4 strings from a single os.urandom call."""
+    raw = bytearray(os.urandom(16 * n))
+    out = []
+    for off in range(0, 16 * n, 16):
+        raw[off + 6] = (raw[off + 6] & 0x0F) | 0x40  # version 4
+        raw[off + 8] = (raw[off + 8] & 0x3F) | 0x80  # RFC 4122 variant
+        h = raw[off:off + 16].hex()
+        out.append(f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}")
+    return out
+
+
 # ==============================================================
 # Symbol Generator
 # ==============================================================
 
-def generate_symbol(spec: SymbolSpec) -> str:
-    """Generate a KiCad .kicad_sym symbol definition."""
-    
-    half_w = spec.body_width / 2
-    half_h = spec.body_height / 2
-    
-    pins_sexpr = ""
-    for pin in spec.pins:
-        pins_sexpr += f"""
-      (pin {pin.electrical_type} {pin.shape}
-        (at {pin.x} {pin.y} {pin.orientation})
-        (length {pin.length})
-        (name "{pin.name}" (effects (font (size 1.27 1.27))))
-        (number "{pin.number}" (effects (font (size 1.27 1.27))))
+_PIN_TMPL = """
+      (pin {etype} {shape}
+        (at {x} {y} {ori})
+        (length {length})
+        (name "{pname}" (effects (font (size 1.27 1.27))))
+        (number "{pnum}" (effects (font (size 1.27 1.27))))
       )"""
-    
-    return f"""  (symbol "{spec.name}"
+
+_SYMBOL_TMPL = """  (symbol "{name}"
     (pin_names (offset 1.016))
     (exclude_from_sim no)
     (in_bom yes)
     (on_board yes)
-    (property "Reference" "{spec.reference}"
-      (at 0 {half_h + 2.54} 0)
+    (property "Reference" "{reference}"
+      (at 0 {ref_y} 0)
       (effects (font (size 1.27 1.27)))
     )
-    (property "Value" "{spec.name}"
-      (at 0 {-(half_h + 2.54)} 0)
+    (property "Value" "{name}"
+      (at 0 {val_y} 0)
       (effects (font (size 1.27 1.27)))
     )
-    (property "Footprint" "{spec.footprint}"
-      (at 0 {-(half_h + 5.08)} 0)
+    (property "Footprint" "{footprint}"
+      (at 0 {fp_y} 0)
       (effects (font (size 1.27 1.27)) hide)
     )
-    (property "Datasheet" "{spec.datasheet}"
-      (at 0 {-(half_h + 7.62)} 0)
+    (property "Datasheet" "{datasheet}"
+      (at 0 {ds_y} 0)
       (effects (font (size 1.27 1.27)) hide)
     )
-    (property "Description" "{spec.description}"
-      (at 0 {-(half_h + 10.16)} 0)
+    (property "Description" "{description}"
+      (at 0 {desc_y} 0)
       (effects (font (size 1.27 1.27)) hide)
     )
-    (symbol "{spec.name}_0_1"
+    (symbol "{name}_0_1"
       (rectangle
-        (start {-half_w} {half_h})
-        (end {half_w} {-half_h})
+        (start {left} {top})
+        (end {right} {bottom})
         (stroke (width 0.254) (type default))
         (fill (type background))
       )
     )
-    (symbol "{spec.name}_1_1"{pins_sexpr}
+    (symbol "{name}_1_1"{pins}
     )
   )"""
 
 
-def generate_symbol_library(symbols: list[SymbolSpec]) -> str:
-    """Generate a complete .kicad_sym library file."""
+def generate_symbol(spec: SymbolSpec) -> str:
+    """Generate a KiCad .kicad_sym symbol definition."""
     
-    symbol_defs = "\n\n".join(generate_symbol(s) for s in symbols)
+    half_w = spec.body_width / 2
+    half_h = spec.body_height / 2
+    
+    parts = []
+    for pin in spec.pins:
+        parts.append(_PIN_TMPL.format(
+            etype=pin.electrical_type, shape=pin.shape,
+            x=pin.x, y=pin.y, ori=pin.orientation, length=pin.length,
+            pname=pin.name, pnum=pin.number,
+        ))
+    pins_sexpr = "".join(parts)
     
-    return f"""(kicad_symbol_lib
+    return _SYMBOL_TMPL.format(
+        name=spec.name,
+        reference=spec.reference,
+        footprint=spec.footprint,
+        datasheet=spec.datasheet,
+        description=spec.description,
+        ref_y=half_h + 2.54,
+        val_y=-(half_h + 2.54),
+        fp_y=-(half_h + 5.08),
+        ds_y=-(half_h + 7.62),
+        desc_y=-(half_h + 10.16),
+        left=-half_w, top=half_h,
+        right=half_w, bottom=-half_h,
+        pins=pins_sexpr,
+    )
+
+
+_SYMBOL_LIB_HEADER = """(kicad_symbol_lib
   (version 20231120)
   (generator "petfilter_libgen")
   (generator_version "1.0")
 
-{symbol_defs}
-)
 """
 
 
+def write_symbol_library(symbols: Iterable[SymbolSpec], out: TextIO) -> None:
+    """Stream a complete .kicad_sym library file to out, one symbol at a time."""
+    
+    out.write(_SYMBOL_LIB_HEADER)
+    first = True
+    for s in symbols:
+        if not first:
+            out.write("\n\n")
+        first = False
+        out.write(generate_symbol(s))
+    out.write("\n)\n")
+
+
+def generate_symbol_library(symbols: list[SymbolSpec]) -> str:
+    """Generate a complete .kicad_sym library file."""
+    
+    buf = io.StringIO()
+    write_symbol_library(symbols, buf)
+    return buf.getvalue()
+
+
 # ==============================================================
 # Footprint Generator
 # ==============================================================
 
-def generate_footprint(spec: FootprintSpec) -> str:
-    """Generate a KiCad .kicad_mod footprint definition."""
-    
-    half_w = spec.body_width / 2
-    half_h = spec.body_height / 2
-    cy_margin = spec.courtyard_margin
-    
-    # Generate pad definitions
-    pads_sexpr = ""
-    for pad in spec.pads:
-        drill_str = ""
-        if pad.drill is not None:
-            drill_str = f"\n    (drill {pad.drill})"
-        
-        layers = pad.layers
-        if pad.pad_type == "thru_hole":
-            layers = '"*.Cu" "*.Mask"'
-        
-        rot_str = ""
-        if pad.rotation != 0:
-            rot_str = f" {pad.rotation}"
-        
-        pads_sexpr += f"""
-  (pad "{pad.number}" {pad.pad_type} {pad.shape}
-    (at {pad.x} {pad.y}{rot_str})
-    (size {pad.width} {pad.height}){drill_str}
+_PAD_TMPL = """
+  (pad "{number}" {pad_type} {shape}
+    (at {x} {y}{rot})
+    (size {width} {height}){drill}
     (layers {layers})
-    (uuid "{gen_uuid()}")
+    (uuid "{uuid}")
   )"""
-    
-    return f"""(footprint "{spec.name}"
+
+_FOOTPRINT_TMPL = """(footprint "{name}"
   (version 20231014)
   (generator "petfilter_libgen")
   (layer "F.Cu")
-  (descr "{spec.description}")
-  (tags "{spec.tags}")
-  (attr {spec.attr})
+  (descr "{description}")
+  (tags "{tags}")
+  (attr {attr})
   (fp_text reference "REF**"
-    (at 0 {-(half_h + 2)})
+    (at 0 {ref_y})
     (layer "F.SilkS")
     (effects (font (size 1 1) (thickness 0.15)))
-    (uuid "{gen_uuid()}")
+    (uuid "{ref_uuid}")
   )
-  (fp_text value "{spec.name}"
-    (at 0 {half_h + 2})
+  (fp_text value "{name}"
+    (at 0 {val_y})
     (layer "F.Fab")
     (effects (font (size 1 1) (thickness 0.15)))
-    (uuid "{gen_uuid()}")
+    (uuid "{val_uuid}")
   )
   (fp_rect
-    (start {-half_w} {-half_h})
-    (end {half_w} {half_h})
+    (start {fab_x0} {fab_y0})
+    (end {fab_x1} {fab_y1})
     (stroke (width 0.1) (type default))
     (fill no)
     (layer "F.Fab")
-    (uuid "{gen_uuid()}")
+    (uuid "{fab_uuid}")
   )
   (fp_rect
-    (start {-(half_w + cy_margin)} {-(half_h + cy_margin)})
-    (end {half_w + cy_margin} {half_h + cy_margin})
+    (start {crt_x0} {crt_y0})
+    (end {crt_x1} {crt_y1})
     (stroke (width 0.05) (type default))
     (fill no)
     (layer "F.CrtYd")
-    (uuid "{gen_uuid()}")
-  ){pads_sexpr}
+    (uuid "{crt_uuid}")
+  ){pads}
 )
 """
 
 
+def _pad_fragments(pad: Pad) -> tuple[str, str, str]:
+    """Optional drill clause, rotation suffix and effective layer list of a pad."""
+    drill = f"\n    (drill {pad.drill})" if pad.drill is not None else ""
+    rot = f" {pad.rotation}" if pad.rotation != 0 else ""
+    layers = _TH_LAYERS if pad.pad_type == "thru_hole" else pad.layers
+    return drill, rot, layers
+
+
+def generate_footprint(spec: FootprintSpec) -> str:
+    """Generate a KiCad .kicad_mod footprint definition."""
+    
+    half_w = spec.body_width / 2
+    half_h = spec.body_height / 2
+    cy_margin = spec.courtyard_margin
+    
+    # One batch of UUIDs: one per pad, then the four header elements
+    uuids = _batch_uuids(len(spec.pads) + 4)
+    
+    # Generate pad definitions
+    parts = []
+    for pad, pad_uuid in zip(spec.pads, uuids):
+        drill_str, rot_str, layers = _pad_fragments(pad)
+        parts.append(_PAD_TMPL.format(
+            number=pad.number, pad_type=pad.pad_type, shape=pad.shape,
+            x=pad.x, y=pad.y, rot=rot_str,
+            width=pad.width, height=pad.height, drill=drill_str,
+            layers=layers, uuid=pad_uuid,
+        ))
+    pads_sexpr = "".join(parts)
+    
+    return _FOOTPRINT_TMPL.format(
+        name=spec.name,
+        description=spec.description,
+        tags=spec.tags,
+        attr=spec.attr,
+        ref_y=-(half_h + 2),
+        ref_uuid=uuids[-4],
+        val_y=half_h + 2,
+        val_uuid=uuids[-3],
+        fab_x0=-half_w, fab_y0=-half_h,
+        fab_x1=half_w, fab_y1=half_h,
+        fab_uuid=uuids[-2],
+        crt_x0=-(half_w + cy_margin), crt_y0=-(half_h + cy_margin),
+        crt_x1=half_w + cy_margin, crt_y1=half_h + cy_margin,
+        crt_uuid=uuids[-1],
+        pads=pads_sexpr,
+    )
+
+
 # ==============================================================
 # Circular Pad Array (for sensors like MQ-137)
 # ==============================================================
 
+def _circ_coords(n: int, radius: float, start_angle: float) -> tuple[list[float], list[float]]:
+    """Coordinate kernel: X and Y columns for n points on a circle."""
+    if n == 0:
+        return [], []
+    step = 360.0 / n
+    angles = [math.radians(start_angle + step * i) for i in range(n)]
+    xs = [round(radius * math.cos(a), 3) for a in angles]
+    ys = [round(-radius * math.sin(a), 3) for a in angles]  # KiCad Y is inverted
+    return xs, ys
+
+
 def circular_pad_array(
     num_pins: int,
     radius: float,
@@ -259,26 +356,23 @@ def circular_pad_array(
     start_angle: float = 0.0,
 ) -> list[Pad]:
     """Generate pads arranged in a circle (for TO-5, MQ sensors, etc.)."""
-    pads = []
-    for i in range(num_pins):
-        angle_rad = math.radians(start_angle + (360.0 / num_pins) * i)
-        x = round(radius * math.cos(angle_rad), 3)
-        y = round(-radius * math.sin(angle_rad), 3)  # KiCad Y is inverted
-        pads.append(Pad(
-            number=str(i + 1),
-            pad_type=pad_type,
-            shape=pad_shape,
-            x=x, y=y,
-            width=pad_width, height=pad_height,
-            drill=drill,
-        ))
-    return pads
+    xs, ys = _circ_coords(num_pins, radius, start_angle)
+    return [
+        Pad(str(i + 1), pad_type, pad_shape, x, y, pad_width, pad_height, drill)
+        for i, (x, y) in enumerate(zip(xs, ys))
+    ]
 
 
 # ==============================================================
 # Linear Pad Array (for SOIC, SOT, QFP, etc.)
 # ==============================================================
 
+def _row_xs(n: int, pitch: float) -> list[float]:
+    """Coordinate kernel: X positions of n pads at pitch, centered on 0."""
+    start_x = -pitch * (n - 1) / 2
+    return [round(start_x + pitch * i, 3) for i in range(n)]
+
+
 def dual_row_smd_pads(
     num_pins: int,
     pitch: float,
@@ -287,35 +381,24 @@ def dual_row_smd_pads(
     row_spacing: float,
 ) -> list[Pad]:
     """Generate SMD pads in two rows (SOIC, TSSOP, etc.)."""
-    pads = []
     pins_per_side = num_pins // 2
     
-    # Calculate starting X offset to center the row
-    start_x = -pitch * (pins_per_side - 1) / 2
+    # Both rows share the same centered X column
+    xs = _row_xs(pins_per_side, pitch)
+    y_bot = round(row_spacing / 2, 3)
+    y_top = round(-row_spacing / 2, 3)
     
     # Bottom row (pins 1 to N/2)
-    for i in range(pins_per_side):
-        pads.append(Pad(
-            number=str(i + 1),
-            pad_type="smd",
-            shape="rect",
-            x=round(start_x + pitch * i, 3),
-            y=round(row_spacing / 2, 3),
-            width=pad_width,
-            height=pad_height,
-        ))
+    pads = [
+        Pad(str(i + 1), "smd", "rect", x, y_bot, pad_width, pad_height)
+        for i, x in enumerate(xs)
+    ]
     
     # Top row (pins N/2+1 to N, reversed)
-    for i in range(pins_per_side):
-        pads.append(Pad(
-            number=str(num_pins - i),
-            pad_type="smd",
-            shape="rect",
-            x=round(start_x + pitch * i, 3),
-            y=round(-row_spacing / 2, 3),
-            width=pad_width,
-            height=pad_height,
-        ))
+    pads.extend(
+        Pad(str(num_pins - i), "smd", "rect", x, y_top, pad_width, pad_height)
+        for i, x in enumerate(xs)
+    )
     
     return pads
 
@@ -324,6 +407,24 @@ def dual_row_smd_pads(
 # QFN Exposed Pad with DFM Paste Segmentation
 # ==============================================================
 
+def _paste_grid_coords(
+    pad_width: float,
+    pad_height: float,
+    grid_cols: int,
+    grid_rows: int,
+) -> tuple[list[float], list[float]]:
+    """Coordinate kernel: row-major X and Y of the paste window centers."""
+    x_spacing = pad_width / (grid_cols + 1)
+    y_spacing = pad_height / (grid_rows + 1)
+    # X depends only on the column and Y only on the row: round each axis once,
+    # then expand to the row-major grid
+    col_xs = [round(-pad_width / 2 + x_spacing * (col + 1), 3) for col in range(grid_cols)]
+    row_ys = [round(-pad_height / 2 + y_spacing * (row + 1), 3) for row in range(grid_rows)]
+    xs = col_xs * grid_rows
+    ys = [py for py in row_ys for _ in range(grid_cols)]
+    return xs, ys
+
+
 def qfn_exposed_pad_with_paste_grid(
     pad_width: float,
     pad_height: float,
@@ -346,13 +447,8 @@ def qfn_exposed_pad_with_paste_grid(
     
     # Main copper pad (no paste)
     pads.append(Pad(
-        number=pad_number,
-        pad_type="smd",
-        shape="rect",
-        x=0, y=0,
-        width=pad_width,
-        height=pad_height,
-        layers='"F.Cu" "F.Mask"',  # No F.Paste!
+        pad_number, "smd", "rect", 0, 0, pad_width, pad_height,
+        None, _CU_MASK_LAYERS,  # No F.Paste!
     ))
     
     # Calculate paste window dimensions for target coverage
@@ -360,23 +456,12 @@ def qfn_exposed_pad_with_paste_grid(
     window_w = round(math.sqrt(total_paste_area / (grid_cols * grid_rows)) * (pad_width / pad_height) ** 0.5, 3)
     window_h = round(total_paste_area / (grid_cols * grid_rows * window_w), 3)
     
-    # Paste grid spacing
-    x_spacing = pad_width / (grid_cols + 1)
-    y_spacing = pad_height / (grid_rows + 1)
-    
-    for row in range(grid_rows):
-        for col in range(grid_cols):
-            px = round(-pad_width / 2 + x_spacing * (col + 1), 3)
-            py = round(-pad_height / 2 + y_spacing * (row + 1), 3)
-            pads.append(Pad(
-                number=pad_number,
-                pad_type="smd",
-                shape="rect",
-                x=px, y=py,
-                width=window_w,
-                height=window_h,
-                layers='"F.Paste"',  # Paste only
-            ))
+    xs, ys = _paste_grid_coords(pad_width, pad_height, grid_cols, grid_rows)
+    for px, py in zip(xs, ys):
+        pads.append(Pad(
+            pad_number, "smd", "rect", px, py, window_w, window_h,
+            None, _PASTE_LAYER,  # Paste only
+        ))
     
     return pads
 
@@ -0,0 +1,25 @@
+"""Tests for the pad-array helpers in kicad_libgen."""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from kicad_libgen import _circ_coords, circular_pad_array  # noqa: E402
+
+
+class CircularPadArrayTest(unittest.TestCase):
+    def test_zero_pins_gives_no_pads(self):
+        self.assertEqual(_circ_coords(0, 2.5, 0.0), ([], []))
+        self.assertEqual(circular_pad_array(0, 2.5), [])
+
+    def test_four_pins_on_axes(self):
+        xs, ys = _circ_coords(4, 2.5, 0.0)
+        self.assertEqual(xs, [2.5, 0.0, -2.5, -0.0])
+        self.assertEqual(ys, [-0.0, -2.5, -0.0, 2.5])
+        pads = circular_pad_array(4, 2.5)
+        self.assertEqual([p.number for p in pads], ["1", "2", "3", "4"])
+
+
+if __name__ == "__main__":
+    unittest.main()